@@ -8,7 +8,10 @@
  */
 
 import * as fs from "node:fs";
+import * as os from "node:os";
 import * as path from "node:path";
+import { fileURLToPath } from "node:url";
+import { isMainThread, parentPort, Worker } from "node:worker_threads";
 
 type Row = Record<string, unknown>;
 
@@ -19,6 +22,16 @@ type Cli = {
   verbose: boolean;
 };
 
+type ConvertTask = {
+  idx: number;
+  inputPath: string;
+  outputPath: string;
+};
+
+type ConvertResult =
+  | { ok: true; rows: number; elapsed: number }
+  | { ok: false; message: string; detail: string };
+
 const PREFERRED_FIELDS = [
   "index",
   "name",
@@ -33,6 +46,51 @@ const PREFERRED_FIELDS = [
   "scannedAtUtc",
 ] as const;
 
+const PREFERRED_FIELD_RANK = new Map<string, number>(
+  PREFERRED_FIELDS.map((f, i) => [f, i])
+);
+
+const ROWS_KEY = '["rows"]';
+
+// Same ordering as String#localeCompare, without re-resolving the locale on
+// every comparison.
+const PATH_COLLATOR = new Intl.Collator();
+
+// Everything the rows scan cares about, in one alternation:
+//  - a `["key"] = value` pair: key in group 1, value either a string literal
+//    (group 2 holds the still-escaped body), the opening brace of a nested
+//    table (group 3) or a bare scalar up to the next separator (group 4);
+//  - any other string literal, skipped so braces inside it are ignored;
+//  - a brace (group 5);
+//  - a quote that opens no complete string literal (group 6), i.e. a string
+//    left unterminated by a truncated or corrupt file.
+// Anything in between (commas, comments, positional values) is skipped by the
+// regex engine rather than char by char.
+const ROW_SCAN_RE =
+  /\["([^"]*)"\]\s*=\s*(?:"((?:\\[\s\S]|[^"\\])*)"|(\{)|([^,\r\n{}"]*))|"(?:\\[\s\S]|[^"\\])*"|([{}])|(")/g;
+
+const LUA_ESCAPE_RE = /\\([\s\S])/g;
+
+// Escapes that map to a different char; any other escaped char (\\, \")
+// stands for itself.
+const LUA_ESCAPES = new Map<string, string>([
+  ["n", "\n"],
+  ["r", "\r"],
+  ["t", "\t"],
+]);
+
+const NON_ASCII_RE = /[^\x00-\x7f]/;
+
+// Decimal integers that survive a Number round-trip unchanged: no leading
+// zeros, no "-0", and at most 15 digits so they stay below 2^53.
+const CANONICAL_INT_RE = /^-?[1-9]\d{0,14}$|^0$/;
+const FLOAT_CHARS_RE = /[.eE]/;
+
+const CSV_NEEDS_QUOTES_RE = /[",\r\n]|^\s|\s$/;
+
+// Flush the CSV output once the pending text reaches this many chars.
+const CSV_CHUNK_CHARS = 1 << 20;
+
 function ts(): string {
   const d = new Date();
   const pad = (n: number) => String(n).padStart(2, "0");
@@ -107,159 +165,97 @@ function* walkFiles(rootDir: string): Generator<string> {
 }
 
 function iterLuaInputs(dataDir: string): string[] {
-  const paths: string[] = [];
+  // Lowercase each path once up front instead of twice per comparison.
+  const keyed: [string, string][] = [];
   for (const p of walkFiles(dataDir)) {
     const lower = p.toLowerCase();
-    if (lower.endsWith(".lua") || lower.endsWith(".lua.bak")) paths.push(p);
+    if (lower.endsWith(".lua") || lower.endsWith(".lua.bak"))
+      keyed.push([lower, p]);
   }
-  paths.sort((a, b) => a.toLowerCase().localeCompare(b.toLowerCase()));
-  return paths;
+  keyed.sort((a, b) => PATH_COLLATOR.compare(a[0], b[0]));
+  return keyed.map(([, p]) => p);
 }
 
-function hasMatchingCsv(inputPath: string): boolean {
+function csvNamesIn(
+  directory: string,
+  cache: Map<string, string[]>
+): string[] {
+  // One readdir per directory per run; most inputs share ./data.
+  let names = cache.get(directory);
+  if (names === undefined) {
+    try {
+      names = fs
+        .readdirSync(directory)
+        .filter((name) => name.toLowerCase().endsWith(".csv"));
+    } catch {
+      names = [];
+    }
+    cache.set(directory, names);
+  }
+  return names;
+}
+
+function hasMatchingCsv(
+  inputPath: string,
+  csvCache: Map<string, string[]>
+): boolean {
   const directory = path.dirname(inputPath) || ".";
   const base = path.basename(inputPath);
   const prefix = `${base}.rows`;
 
-  let names: string[];
-  try {
-    names = fs.readdirSync(directory);
-  } catch {
-    return false;
-  }
-
-  for (const name of names) {
-    const lower = name.toLowerCase();
-    if (lower.endsWith(".csv") && name.startsWith(prefix)) return true;
-  }
-  return false;
+  return csvNamesIn(directory, csvCache).some((name) =>
+    name.startsWith(prefix)
+  );
 }
 
 function defaultOutputCsvPath(inputPath: string): string {
   return `${inputPath}.rows.csv`;
 }
 
-function skipLuaString(text: string, i: number): number {
-  // Assumes text[i] === '"'
-  i++;
-  while (i < text.length) {
-    const ch = text[i];
-    if (ch === "\\") {
-      i += 2;
-      continue;
-    }
-    if (ch === '"') return i + 1;
-    i++;
-  }
-  return i;
+function decodeUtf8Span(span: string): string {
+  // The rows text is a one-char-per-byte (latin1) view of the file; only
+  // spans that contain multi-byte UTF-8 sequences need decoding.
+  if (!NON_ASCII_RE.test(span)) return span;
+  return Buffer.from(span, "latin1").toString("utf8");
 }
 
-function extractBalancedBraces(text: string, start: number): string {
-  if (start < 0 || start >= text.length || text[start] !== "{") {
-    throw new Error("start must point at '{'");
-  }
-
-  let depth = 0;
-  let i = start;
-  while (i < text.length) {
-    const ch = text[i];
-    if (ch === '"') {
-      i = skipLuaString(text, i);
-      continue;
-    }
-    if (ch === "{") {
-      depth++;
-    } else if (ch === "}") {
-      depth--;
-      if (depth === 0) return text.slice(start, i + 1);
-    }
-    i++;
-  }
-
-  throw new Error("Unbalanced braces while parsing Lua table");
+function unescapeLuaString(body: string): string {
+  // Most strings (names, item links, timestamps) contain no escapes at all.
+  if (!body.includes("\\")) return body;
+  return body.replace(LUA_ESCAPE_RE, (_, c: string) =>
+    LUA_ESCAPES.get(c) ?? c
+  );
 }
 
-function findRowsBlock(text: string): string {
-  const rowsKeyPos = text.indexOf('["rows"]');
+function findRowsBlock(buf: Buffer): string {
+  // Locate the block on the raw bytes (the markers are ASCII) and only read
+  // from its opening brace on; nothing before it is ever needed as text.
+  // The returned text starts at that brace; iterRows stops at its match.
+  // It is a latin1 view (one char per byte): all Lua syntax is ASCII and
+  // UTF-8 continuation bytes never look like it, so structure is scanned
+  // without decoding and string values go through decodeUtf8Span.
+  const rowsKeyPos = buf.indexOf(ROWS_KEY);
   if (rowsKeyPos === -1)
-    throw new Error('Could not find ["rows"] in input file');
+    throw new Error(`Could not find ${ROWS_KEY} in input file`);
 
-  const bracePos = text.indexOf("{", rowsKeyPos);
+  const bracePos = buf.indexOf("{", rowsKeyPos);
   if (bracePos === -1)
-    throw new Error('Could not find opening "{" after ["rows"]');
+    throw new Error(`Could not find opening "{" after ${ROWS_KEY}`);
 
-  return extractBalancedBraces(text, bracePos);
-}
-
-function extractRowTables(rowsBlock: string): string[] {
-  let inner = rowsBlock.trim();
-  if (!(inner.startsWith("{") && inner.endsWith("}"))) {
-    throw new Error("rowsBlock is not a Lua table");
-  }
-
-  inner = inner.slice(1, -1);
-
-  const rows: string[] = [];
-  let i = 0;
-  while (i < inner.length) {
-    const ch = inner[i];
-    if (ch === "," || ch === " " || ch === "\t" || ch === "\n" || ch === "\r") {
-      i++;
-      continue;
-    }
-    if (ch === '"') {
-      i = skipLuaString(inner, i);
-      continue;
-    }
-    if (ch !== "{") {
-      // Unexpected token at top-level; skip forward defensively.
-      i++;
-      continue;
-    }
-
-    const rowText = extractBalancedBraces(inner, i);
-    rows.push(rowText);
-    i += rowText.length;
-  }
-
-  return rows;
-}
-
-function parseLuaString(text: string, i: number): [string, number] {
-  // Assumes text[i] === '"'
-  i++;
-  const out: string[] = [];
-  while (i < text.length) {
-    const ch = text[i];
-    if (ch === "\\" && i + 1 < text.length) {
-      const nxt = text[i + 1];
-      if (
-        nxt === "\\" ||
-        nxt === '"' ||
-        nxt === "n" ||
-        nxt === "r" ||
-        nxt === "t"
-      ) {
-        if (nxt === "n") out.push("\n");
-        else if (nxt === "r") out.push("\r");
-        else if (nxt === "t") out.push("\t");
-        else out.push(nxt);
-        i += 2;
-        continue;
-      }
-      out.push(nxt);
-      i += 2;
-      continue;
-    }
-    if (ch === '"') return [out.join(""), i + 1];
-    out.push(ch);
-    i++;
-  }
-  return [out.join(""), i];
+  return buf.toString("latin1", bracePos);
 }
 
 function parseScalar(token: string): unknown {
-  const t = token.trim();
+  // Most scalars are plain integers (ids, counts, copper); take them first.
+  // A match is pure ASCII with no surrounding whitespace, so it needs neither
+  // trimming nor decoding.
+  if (CANONICAL_INT_RE.test(token)) return Number(token);
+
+  // `token` is a latin1 view (see findRowsBlock). Decode before trimming:
+  // trim() also strips U+0085/U+00A0, which in the view can be a UTF-8
+  // continuation byte rather than whitespace.
+  const t = decodeUtf8Span(token).trim();
+  if (CANONICAL_INT_RE.test(t)) return Number(t);
   if (t === "") return "";
   if (t === "true") return true;
   if (t === "false") return false;
@@ -272,7 +268,7 @@ function parseScalar(token: string): unknown {
     return t;
   }
 
-  if (/[.eE]/.test(t)) {
+  if (FLOAT_CHARS_RE.test(t)) {
     const n = Number.parseFloat(t);
     if (!Number.isNaN(n)) return n;
     return t;
@@ -283,124 +279,141 @@ function parseScalar(token: string): unknown {
   return t;
 }
 
-function parseRowTable(rowTable: string): Row {
-  let s = rowTable.trim();
-  if (!(s.startsWith("{") && s.endsWith("}")))
-    throw new Error("rowTable is not a Lua table");
-
-  s = s.slice(1, -1);
-  const row: Row = {};
-
-  let i = 0;
-  while (i < s.length) {
-    const keyStart = s.indexOf('["', i);
-    if (keyStart === -1) break;
-
-    const keyEnd = s.indexOf('"]', keyStart + 2);
-    if (keyEnd === -1) break;
-
-    const key = s.slice(keyStart + 2, keyEnd);
-
-    const eqPos = s.indexOf("=", keyEnd + 2);
-    if (eqPos === -1) break;
-
-    let j = eqPos + 1;
-    while (
-      j < s.length &&
-      (s[j] === " " || s[j] === "\t" || s[j] === "\n" || s[j] === "\r")
-    )
-      j++;
-    if (j >= s.length) break;
-
-    let value: unknown;
-    if (s[j] === '"') {
-      const [val, j2] = parseLuaString(s, j);
-      value = val;
-      j = j2;
-    } else if (s[j] === "{") {
-      const raw = extractBalancedBraces(s, j);
-      value = raw;
-      j += raw.length;
-    } else {
-      let k = j;
-      while (k < s.length && s[k] !== "," && s[k] !== "\n" && s[k] !== "\r") {
-        if (s[k] === "}") break;
-        k++;
+function* iterRows(text: string): Generator<Row> {
+  // `text` starts at the opening brace of the rows table. Rows are built in
+  // the same pass that matches braces: depth 1 is the rows table, depth 2 a
+  // row, anything deeper a nested table kept as raw Lua text.
+  if (text[0] !== "{") throw new Error("rows block is not a Lua table");
+
+  let depth = 0;
+  let row: Row = {};
+  let nestedKey = "";
+  let nestedStart = -1;
+  let pos = 0;
+  let m: RegExpExecArray | null;
+  while (true) {
+    ROW_SCAN_RE.lastIndex = pos;
+    m = ROW_SCAN_RE.exec(text);
+    if (m === null) break;
+    pos = ROW_SCAN_RE.lastIndex;
+
+    const key = m[1];
+    if (key !== undefined) {
+      if (m[3] !== undefined) {
+        depth++;
+        if (depth === 2) {
+          row = {};
+        } else if (depth === 3) {
+          nestedKey = key;
+          nestedStart = pos - 1;
+        }
+      } else if (depth === 2) {
+        row[key] =
+          m[2] !== undefined
+            ? unescapeLuaString(decodeUtf8Span(m[2]))
+            : parseScalar(m[4]);
       }
-      value = parseScalar(s.slice(j, k));
-      j = k;
+      continue;
+    }
+
+    if (m[6] !== undefined) {
+      throw new Error("Unterminated string while parsing Lua table");
     }
 
-    row[key] = value;
-    i = j;
+    const brace = m[5];
+    if (brace === "{") {
+      depth++;
+      if (depth === 2) row = {};
+    } else if (brace === "}") {
+      if (depth === 3 && nestedStart !== -1) {
+        row[nestedKey] = decodeUtf8Span(text.slice(nestedStart, pos));
+        nestedStart = -1;
+      }
+      depth--;
+      if (depth === 1) yield row;
+      else if (depth === 0) return;
+    }
   }
 
-  return row;
+  throw new Error("Unbalanced braces while parsing Lua table");
 }
 
 function preferredFieldOrder(fields: string[]): string[] {
-  const preferred: string[] = [...PREFERRED_FIELDS];
-  const remaining = fields.filter((f) => !preferred.includes(f));
-  const ordered = preferred
-    .filter((f) => fields.includes(f))
-    .concat(remaining.sort());
-  return ordered;
+  // Preferred fields in their listed order, then everything else by name.
+  const rank = (f: string) =>
+    PREFERRED_FIELD_RANK.get(f) ?? PREFERRED_FIELDS.length;
+  return [...fields].sort(
+    (a, b) => rank(a) - rank(b) || (a < b ? -1 : a > b ? 1 : 0)
+  );
 }
 
 function csvEscape(value: unknown): string {
   if (value === null || value === undefined) return "";
+  // Numbers and booleans can never contain a separator, quote or edge space.
+  if (typeof value === "number" || typeof value === "boolean")
+    return String(value);
   const s = String(value);
-  const needsQuotes = /[",\r\n]/.test(s) || /^\s|\s$/.test(s);
-  if (!needsQuotes) return s;
-  return `"${s.replace(/"/g, '""')}"`;
+  if (!CSV_NEEDS_QUOTES_RE.test(s)) return s;
+  return `"${s.replaceAll('"', '""')}"`;
 }
 
 function writeCsvUtf8Bom(
   filePath: string,
   headers: string[],
+  keys: string[],
   rows: Row[]
 ): void {
-  const bom = "\uFEFF";
-  const lines: string[] = [];
-  lines.push(headers.map((h) => csvEscape(h)).join(","));
-  for (const r of rows) {
-    const line = headers.map((h) => csvEscape((r as any)[h])).join(",");
-    lines.push(line);
+  // Stream lines out in chunks rather than holding the whole CSV in memory.
+  // Null/undefined cells and fields not in `keys` (e.g. seller) are
+  // handled here, so rows are written as-is without a sanitized copy.
+  // writeFileSync on an fd keeps writing at the current position until the
+  // whole chunk is out (a single writeSync may return short).
+  const fd = fs.openSync(filePath, "w");
+  try {
+    // `keys[c]` is the row key behind the label `headers[c]`.
+    let chunk =
+      "\uFEFF" + headers.map((h) => csvEscape(h)).join(",") + "\r\n";
+    for (const r of rows) {
+      for (let c = 0; c < keys.length; c++) {
+        if (c) chunk += ",";
+        chunk += csvEscape(r[keys[c]]);
+      }
+      chunk += "\r\n";
+      if (chunk.length >= CSV_CHUNK_CHARS) {
+        fs.writeFileSync(fd, chunk);
+        chunk = "";
+      }
+    }
+    if (chunk) fs.writeFileSync(fd, chunk);
+  } finally {
+    fs.closeSync(fd);
   }
-  const content = bom + lines.join("\r\n") + "\r\n";
-  fs.writeFileSync(filePath, content, { encoding: "utf8" });
 }
 
 function convert(inputPath: string, outputCsvPath: string): number {
-  const text = fs.readFileSync(inputPath, { encoding: "utf8" });
-
-  const rowsBlock = findRowsBlock(text);
-  const rowTables = extractRowTables(rowsBlock);
-
-  const rows: Row[] = rowTables.map(parseRowTable);
+  const text = findRowsBlock(fs.readFileSync(inputPath));
+  const rows: Row[] = [...iterRows(text)];
   if (!rows.length) throw new Error('Parsed 0 rows from ["rows"]');
 
+  // Rows are plain objects with no inherited enumerable keys, so for...in
+  // walks exactly their own keys without an Object.keys array per row.
   const fieldSet = new Set<string>();
   for (const r of rows) {
-    for (const k of Object.keys(r)) fieldSet.add(k);
+    for (const k in r) fieldSet.add(k);
   }
 
   // Retail AH does not expose seller names; omit the field even if present.
   fieldSet.delete("seller");
 
-  const fieldnames = preferredFieldOrder([...fieldSet]);
+  // Row keys are latin1 views of the file (see findRowsBlock). Order and
+  // label columns by their decoded names, but read cells by the raw key.
+  const rawKeyByField = new Map<string, string>();
+  for (const k of fieldSet) rawKeyByField.set(decodeUtf8Span(k), k);
 
-  // Ensure seller omitted even if present.
-  const sanitized = rows.map((r) => {
-    const out: Row = {};
-    for (const [k, v] of Object.entries(r)) {
-      if (k === "seller") continue;
-      out[k] = v === null ? "" : v;
-    }
-    return out;
-  });
+  const fieldnames = preferredFieldOrder([...rawKeyByField.keys()]);
+  const rawKeys = fieldnames.map((f) => rawKeyByField.get(f)!);
 
-  writeCsvUtf8Bom(outputCsvPath, fieldnames, sanitized);
+  writeCsvUtf8Bom(outputCsvPath, fieldnames, rawKeys, rows);
   return rows.length;
 }
 
@@ -418,10 +431,100 @@ function logFoundInputs(inputPaths: string[], baseDir: string): void {
   if (remaining > 0) log("auctionexport_to_csv", `  ... and ${remaining} more`);
 }
 
-function main(): number {
+function runConvertTask(task: ConvertTask): ConvertResult {
+  const start = performance.now();
+  try {
+    const rows = convert(task.inputPath, task.outputPath);
+    return { ok: true, rows, elapsed: (performance.now() - start) / 1000 };
+  } catch (e) {
+    return { ok: false, message: (e as Error).message, detail: String(e) };
+  }
+}
+
+function runInWorkers(
+  tasks: ConvertTask[],
+  onStart: (task: ConvertTask) => void,
+  onDone: (task: ConvertTask, result: ConvertResult) => void
+): Promise<void> {
+  // Each file is independent, so hand them out to a small pool of worker
+  // threads running this same script; a worker takes the next task as soon
+  // as it reports back. A worker that dies fails only the file it was on;
+  // a fresh worker takes its place so the rest of the queue still drains.
+  const size = Math.min(os.availableParallelism(), tasks.length);
+  return new Promise((resolve) => {
+    let next = 0;
+    let done = 0;
+
+    const finish = (task: ConvertTask, result: ConvertResult) => {
+      onDone(task, result);
+      done++;
+      if (done === tasks.length) resolve();
+    };
+
+    const spawn = () => {
+      const worker = new Worker(new URL(import.meta.url));
+      let current: ConvertTask | undefined;
+
+      const feed = () => {
+        if (next >= tasks.length) {
+          current = undefined;
+          void worker.terminate();
+          return;
+        }
+        current = tasks[next++];
+        onStart(current);
+        worker.postMessage(current);
+      };
+
+      const crash = (message: string, detail: string) => {
+        // Idle workers are terminated on purpose once the queue is empty.
+        if (current === undefined) return;
+        const task = current;
+        current = undefined;
+        worker.removeAllListeners();
+        void worker.terminate();
+        finish(task, { ok: false, message, detail });
+        if (next < tasks.length) spawn();
+      };
+
+      worker.on("message", (result: ConvertResult) => {
+        const task = current!;
+        current = undefined;
+        finish(task, result);
+        feed();
+      });
+      worker.on("error", (e) =>
+        crash(`worker failed: ${e.message}`, String(e))
+      );
+      worker.on("exit", (code) => {
+        if (code !== 0) {
+          const message = `worker exited with code ${code}`;
+          crash(message, message);
+        }
+      });
+      feed();
+    };
+
+    for (let i = 0; i < size; i++) spawn();
+  });
+}
+
+function isEntryPoint(): boolean {
+  const entry = process.argv[1];
+  if (!entry) return false;
+  try {
+    return fs.realpathSync(entry) === fileURLToPath(import.meta.url);
+  } catch {
+    return false;
+  }
+}
+
+export async function main(
+  argv: string[] = process.argv.slice(2)
+): Promise<number> {
   let args: Cli;
   try {
-    args = parseArgs(process.argv.slice(2));
+    args = parseArgs(argv);
   } catch (e) {
     warn("auctionexport_to_csv", `ERROR: ${(e as Error).message}`);
     warn(
@@ -463,13 +566,15 @@ function main(): number {
   let failed = 0;
 
   const total = inputPaths.length;
+  const tasks: ConvertTask[] = [];
+  const csvCache = new Map<string, string[]>();
   for (let idx = 0; idx < inputPaths.length; idx++) {
     const inputPath = inputPaths[idx];
     const outputPath = args.output
       ? path.resolve(args.output)
       : defaultOutputCsvPath(inputPath);
 
-    if (hasMatchingCsv(inputPath)) {
+    if (hasMatchingCsv(inputPath, csvCache)) {
       skipped++;
       log(
         "auctionexport_to_csv",
@@ -478,33 +583,47 @@ function main(): number {
       continue;
     }
 
-    try {
-      log(
-        "auctionexport_to_csv",
-        `[${idx + 1}/${total}] Converting: ${rel(inputPath, baseDir)}`
-      );
-      const startFile = performance.now();
-      const n = convert(inputPath, outputPath);
-      const elapsed = (performance.now() - startFile) / 1000;
-      converted++;
-      log(
-        "auctionexport_to_csv",
-        `Wrote ${n} rows to: ${rel(outputPath, baseDir)}`
-      );
-      log(
-        "auctionexport_to_csv",
-        `[${idx + 1}/${total}] Done in ${elapsed.toFixed(2)}s`
-      );
-    } catch (e) {
+    tasks.push({ idx, inputPath, outputPath });
+  }
+
+  const onStart = (task: ConvertTask) => {
+    log(
+      "auctionexport_to_csv",
+      `[${task.idx + 1}/${total}] Converting: ${rel(task.inputPath, baseDir)}`
+    );
+  };
+
+  const onDone = (task: ConvertTask, result: ConvertResult) => {
+    if (!result.ok) {
       failed++;
       warn(
         "auctionexport_to_csv",
-        `ERROR converting ${inputPath}: ${(e as Error).message}`
+        `ERROR converting ${task.inputPath}: ${result.message}`
       );
       if (args.verbose) {
-        warn("auctionexport_to_csv", String(e));
+        warn("auctionexport_to_csv", result.detail);
       }
+      return;
     }
+    converted++;
+    log(
+      "auctionexport_to_csv",
+      `Wrote ${result.rows} rows to: ${rel(task.outputPath, baseDir)}`
+    );
+    log(
+      "auctionexport_to_csv",
+      `[${task.idx + 1}/${total}] Done in ${result.elapsed.toFixed(2)}s`
+    );
+  };
+
+  if (tasks.length <= 1) {
+    // Not worth spinning up a worker for a single file.
+    for (const task of tasks) {
+      onStart(task);
+      onDone(task, runConvertTask(task));
+    }
+  } else {
+    await runInWorkers(tasks, onStart, onDone);
   }
 
   const totalElapsed = (performance.now() - startTotal) / 1000;
@@ -519,4 +638,12 @@ function main(): number {
   return 0;
 }
 
-process.exitCode = main();
+if (!isMainThread) {
+  parentPort!.on("message", (task: ConvertTask) => {
+    parentPort!.postMessage(runConvertTask(task));
+  });
+} else if (isEntryPoint()) {
+  main().then((code) => {
+    process.exitCode = code;
+  });
+}
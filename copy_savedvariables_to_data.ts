@@ -11,6 +11,7 @@ import * as fs from "node:fs";
 import * as path from "node:path";
 import { stdin as input, stdout as output } from "node:process";
 import * as readline from "node:readline/promises";
+import { fileURLToPath } from "node:url";
 
 const DEFAULT_ACCOUNT_ROOT =
   "C:\\Program Files (x86)\\World of Warcraft\\_retail_\\WTF\\Account";
@@ -168,7 +169,9 @@ async function resolveAccount(
 function copyIfExists(src: string, dest: string): boolean {
   if (!fs.existsSync(src)) return false;
   fs.mkdirSync(path.dirname(dest), { recursive: true });
-  fs.copyFileSync(src, dest);
+  // Try a copy-on-write clone first (btrfs, XFS, APFS, ReFS); libuv falls
+  // back to its regular kernel-side copy where that isn't supported.
+  fs.copyFileSync(src, dest, fs.constants.COPYFILE_FICLONE);
   return true;
 }
 
@@ -180,10 +183,22 @@ function timestampYmdHms(): string {
   )}${pad(d.getMinutes())}${pad(d.getSeconds())}`;
 }
 
-async function main(): Promise<number> {
+function isEntryPoint(): boolean {
+  const entry = process.argv[1];
+  if (!entry) return false;
+  try {
+    return fs.realpathSync(entry) === fileURLToPath(import.meta.url);
+  } catch {
+    return false;
+  }
+}
+
+export async function main(
+  argv: string[] = process.argv.slice(2)
+): Promise<number> {
   let args: Cli;
   try {
-    args = parseArgs(process.argv.slice(2));
+    args = parseArgs(argv);
   } catch (e) {
     warn("copy_savedvariables_to_data", `ERROR: ${(e as Error).message}`);
     warn(
@@ -243,6 +258,8 @@ async function main(): Promise<number> {
   return 0;
 }
 
-main().then((code) => {
-  process.exitCode = code;
-});
+if (isEntryPoint()) {
+  main().then((code) => {
+    process.exitCode = code;
+  });
+}
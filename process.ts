@@ -5,9 +5,8 @@
  * 2) Convert any new .lua/.lua.bak files in ./data to CSV (skipping ones that already have matching CSVs).
  */
 
-import { spawnSync } from "node:child_process";
-import * as path from "node:path";
-import { fileURLToPath } from "node:url";
+import { main as convertExports } from "./auctionexport_to_csv.ts";
+import { main as copySavedVariables } from "./copy_savedvariables_to_data.ts";
 
 type Cli = {
   includeBak: boolean;
@@ -77,17 +76,21 @@ function parseArgs(argv: string[]): Cli {
   return out;
 }
 
-function runNodeTs(scriptPath: string, scriptArgs: string[]): number {
-  const node = process.execPath;
-  const args = ["--experimental-strip-types", scriptPath, ...scriptArgs];
-  const completed = spawnSync(node, args, { stdio: "inherit" });
-
-  // If Node couldn't start, map to a non-zero code.
-  if (completed.error) return 2;
-  return completed.status ?? 0;
+async function runStep(
+  step: (argv: string[]) => Promise<number>,
+  stepArgs: string[]
+): Promise<number> {
+  // Both steps run in this process; an unexpected throw maps to a non-zero
+  // code the same way a crashed child process would.
+  try {
+    return await step(stepArgs);
+  } catch (e) {
+    warn("process", `ERROR: ${String(e)}`);
+    return 2;
+  }
 }
 
-function main(): number {
+async function main(): Promise<number> {
   let args: Cli;
   try {
     args = parseArgs(process.argv.slice(2));
@@ -102,10 +105,6 @@ function main(): number {
 
   const startTotal = performance.now();
 
-  const repoDir = path.dirname(fileURLToPath(import.meta.url));
-  const copyScript = path.join(repoDir, "copy_savedvariables_to_data.ts");
-  const convertScript = path.join(repoDir, "auctionexport_to_csv.ts");
-
   const copyArgs: string[] = [];
   if (args.includeBak) copyArgs.push("--include-bak");
   if (args.accountRoot) copyArgs.push("--account-root", args.accountRoot);
@@ -114,7 +113,7 @@ function main(): number {
 
   log("process", "Step 1/2: Copy SavedVariables into ./data");
   let startStep = performance.now();
-  let rc = runNodeTs(copyScript, copyArgs);
+  let rc = await runStep(copySavedVariables, copyArgs);
   log(
     "process",
     `Step 1/2 finished in ${((performance.now() - startStep) / 1000).toFixed(
@@ -132,7 +131,7 @@ function main(): number {
 
   log("process", "Step 2/2: Convert exports in ./data to CSV");
   startStep = performance.now();
-  rc = runNodeTs(convertScript, convertArgs);
+  rc = await runStep(convertExports, convertArgs);
   log(
     "process",
     `Step 2/2 finished in ${((performance.now() - startStep) / 1000).toFixed(
@@ -148,4 +147,6 @@ function main(): number {
   return rc;
 }
 
-process.exitCode = main();
+main().then((code) => {
+  process.exitCode = code;
+});